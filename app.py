@@ -6,6 +6,7 @@ from werkzeug.middleware.proxy_fix import ProxyFix
 from resume_analyzer import ResumeAnalyzer
 from job_matcher import JobMatcher
 from job_data import JobDatabase
+from models import ResumeModel
 
 # Configure logging
 logging.basicConfig(level=logging.DEBUG)
@@ -28,8 +29,13 @@ os.makedirs(UPLOAD_FOLDER, exist_ok=True)
 
 # Initialize components
 resume_analyzer = ResumeAnalyzer()
-job_matcher = JobMatcher()
-job_db = JobDatabase()
+job_matcher = JobMatcher(taxonomy=resume_analyzer.skill_taxonomy)
+job_db = JobDatabase(taxonomy=resume_analyzer.skill_taxonomy)
+
+# Optionally bulk-load a JSONL/CSV job feed at startup. Run gunicorn with
+# --preload so this happens once in the master rather than in every worker
+if os.environ.get('JOB_FEED_PATH'):
+    job_db.ingest_file(os.environ['JOB_FEED_PATH'], job_matcher)
 
 def allowed_file(filename):
     """Check if file extension is allowed"""
@@ -82,19 +88,18 @@ def analyze_resume():
                 os.remove(file_path)
             return redirect(url_for('index'))
         
-        # Get job matches
-        job_matches = []
-        for job_id in selected_jobs:
-            job = job_db.get_job_by_id(job_id)
-            if job:
-                match_result = job_matcher.match_resume_to_job(resume_data, job)
-                job_matches.append(match_result)
+        # Get job matches, comparing skills against all selected jobs at once
+        jobs = [job_db.get_job_by_id(job_id) for job_id in selected_jobs]
+        jobs = [job for job in jobs if job]
+        job_matches = job_matcher.match_resume_to_jobs(resume_data, jobs, job_db.get_skill_matrix())
         
         # Sort matches by similarity score
         job_matches.sort(key=lambda x: x['similarity_score'], reverse=True)
         
-        # Store results in session
-        session['resume_data'] = resume_data
+        # Store results in session without the raw text or skill bitmask
+        session['resume_data'] = ResumeModel.from_resume_data(
+            resume_data, resume_analyzer.skill_taxonomy
+        ).to_dict()
         session['job_matches'] = job_matches
         session['filename'] = filename
         
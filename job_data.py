@@ -1,10 +1,57 @@
+import csv
+import hashlib
+import json
 import logging
+import time
+from collections import Counter
+from models import SkillTaxonomy, JobSkillMatrix, JobModel
+from resume_analyzer import ResumeAnalyzer
+
+def iter_jobs_jsonl(path):
+    """Stream raw job dicts from a JSON Lines file, yielding None for unparseable lines"""
+    with open(path, 'r', encoding='utf-8') as f:
+        for line in f:
+            line = line.strip()
+            if not line:
+                continue
+            try:
+                yield json.loads(line)
+            except json.JSONDecodeError:
+                yield None
+
+def iter_jobs_csv(path):
+    """Stream raw job dicts from a CSV file with a header row"""
+    # utf-8-sig strips the byte-order mark that spreadsheet exports prepend to the header
+    with open(path, 'r', encoding='utf-8-sig', newline='') as f:
+        yield from csv.DictReader(f)
+
+def iter_jobs_file(path):
+    """Stream raw job dicts from a .jsonl/.ndjson or .csv file"""
+    if path.lower().endswith(('.jsonl', '.ndjson')):
+        return iter_jobs_jsonl(path)
+    if path.lower().endswith('.csv'):
+        return iter_jobs_csv(path)
+    raise ValueError(f"Unsupported job feed format: {path}")
+
+def job_content_hash(job_data):
+    """Hash the job's content fields so re-posted jobs de-duplicate regardless of ID"""
+    digest = hashlib.sha1()
+    for field in JobModel.REQUIRED_FIELDS + ('location', 'salary'):
+        value = job_data.get(field)
+        # add_job/update_job accept non-string values such as a numeric salary
+        digest.update(('' if value is None else str(value)).lower().encode('utf-8'))
+        digest.update(b'\x1f')
+    return digest.digest()
 
 class JobDatabase:
     """Simple in-memory job database for demonstration purposes"""
     
-    def __init__(self):
+    def __init__(self, taxonomy=None):
         """Initialize the job database with sample jobs"""
+        if taxonomy is None:
+            taxonomy = SkillTaxonomy(ResumeAnalyzer.load_skills_keywords())
+        self.taxonomy = taxonomy
+        self._skill_matrix = None
         self.jobs = [
             {
                 'id': '1',
@@ -62,18 +109,45 @@ class JobDatabase:
             }
         ]
         
+        for job in self.jobs:
+            self._set_skills_mask(job)
+        
+        self._jobs_by_id = {job['id']: job for job in self.jobs}
+        # Counts per hash, since add_job does not de-duplicate and copies may coexist
+        self._content_hashes = Counter(job_content_hash(job) for job in self.jobs)
+        self._next_id = max([int(job['id']) for job in self.jobs if job['id'].isdigit()], default=0) + 1
+        
         logging.info(f"Job database initialized with {len(self.jobs)} jobs")
     
+    def _add_content_hash(self, content_hash):
+        self._content_hashes[content_hash] += 1
+    
+    def _remove_content_hash(self, content_hash):
+        self._content_hashes[content_hash] -= 1
+        if self._content_hashes[content_hash] <= 0:
+            del self._content_hashes[content_hash]
+    
+    def _set_skills_mask(self, job):
+        """Derive the job's skill bitmask from its description and requirements"""
+        job['skills_mask'] = self.taxonomy.mask_from_text(f"{job['description']} {job['requirements']}")
+    
+    def get_skill_matrix(self):
+        """Get the skill bitmasks of all jobs as a JobSkillMatrix (rebuilt after changes)"""
+        if self._skill_matrix is None:
+            self._skill_matrix = JobSkillMatrix(
+                self.taxonomy,
+                [job['id'] for job in self.jobs],
+                [job['skills_mask'] for job in self.jobs]
+            )
+        return self._skill_matrix
+    
     def get_all_jobs(self):
         """Get all jobs from the database"""
         return self.jobs
     
     def get_job_by_id(self, job_id):
         """Get a specific job by ID"""
-        for job in self.jobs:
-            if job['id'] == job_id:
-                return job
-        return None
+        return self._jobs_by_id.get(job_id)
     
     def get_jobs_by_title(self, title):
         """Get jobs by title (case-insensitive search)"""
@@ -87,28 +161,154 @@ class JobDatabase:
     
     def add_job(self, job_data):
         """Add a new job to the database"""
+        # Hash first so a bad job cannot leave the database half-updated
+        content_hash = job_content_hash(job_data)
+        
         # Generate new ID
-        max_id = max([int(job['id']) for job in self.jobs]) if self.jobs else 0
-        job_data['id'] = str(max_id + 1)
+        job_data['id'] = self._new_id()
+        self._set_skills_mask(job_data)
         
         self.jobs.append(job_data)
+        self._jobs_by_id[job_data['id']] = job_data
+        self._add_content_hash(content_hash)
+        self._skill_matrix = None
         logging.info(f"Added new job: {job_data['title']} at {job_data['company']}")
         return job_data['id']
     
+    def _new_id(self):
+        """Allocate the next numeric job ID"""
+        job_id = str(self._next_id)
+        self._next_id += 1
+        return job_id
+    
+    def ingest_jobs(self, raw_jobs, job_matcher=None, chunk_size=5000, batch_size=256):
+        """Bulk-load jobs from an iterable of raw dicts, e.g. iter_jobs_file(path)
+        
+        Jobs are validated against JobModel, de-duplicated by content hash and
+        committed in chunks. For each chunk, keywords and embeddings are
+        precomputed with the job matcher (embeddings in encoder batches of
+        batch_size) so ingested jobs are immediately matchable. Only one chunk
+        of pending jobs is held besides the database itself. Jobs whose feed
+        ID is already taken are stored under a new ID and counted as renumbered.
+        """
+        stats = {'read': 0, 'ingested': 0, 'duplicates': 0, 'invalid': 0, 'renumbered': 0}
+        start = time.perf_counter()
+        pending = []
+        # Hashes of the uncommitted chunk; they join _content_hashes only once it is stored
+        pending_hashes = set()
+        
+        for raw_job in raw_jobs:
+            stats['read'] += 1
+            try:
+                job = JobModel.validate(raw_job)
+            except ValueError as e:
+                stats['invalid'] += 1
+                logging.debug(f"Skipping invalid job #{stats['read']}: {str(e)}")
+                continue
+            
+            content_hash = job_content_hash(job)
+            if content_hash in self._content_hashes or content_hash in pending_hashes:
+                stats['duplicates'] += 1
+                continue
+            pending_hashes.add(content_hash)
+            
+            pending.append(job)
+            if len(pending) >= chunk_size:
+                stats['renumbered'] += self._commit_chunk(pending, job_matcher, batch_size)
+                stats['ingested'] += len(pending)
+                pending = []
+                pending_hashes = set()
+                logging.info(f"Ingested {stats['ingested']} jobs "
+                             f"({stats['ingested'] / (time.perf_counter() - start):.0f} jobs/s)")
+        
+        if pending:
+            stats['renumbered'] += self._commit_chunk(pending, job_matcher, batch_size)
+            stats['ingested'] += len(pending)
+        
+        if stats['renumbered']:
+            logging.warning(f"{stats['renumbered']} ingested jobs had IDs already in use and were given new IDs")
+        
+        elapsed = time.perf_counter() - start
+        stats['elapsed_s'] = round(elapsed, 3)
+        stats['jobs_per_s'] = round(stats['ingested'] / elapsed, 1) if elapsed else 0.0
+        logging.info(f"Job ingest finished: {stats}")
+        return stats
+    
+    def ingest_file(self, path, job_matcher=None, chunk_size=5000, batch_size=256):
+        """Bulk-load jobs from a JSONL or CSV feed"""
+        return self.ingest_jobs(iter_jobs_file(path), job_matcher, chunk_size, batch_size)
+    
+    def _commit_chunk(self, jobs, job_matcher, batch_size):
+        """Precompute features for a chunk of validated jobs and add them to the database
+        
+        Returns the number of jobs whose feed ID was taken and had to be replaced.
+        Nothing is stored if feature computation fails.
+        """
+        texts = [f"{job['description']} {job['requirements']}" for job in jobs]
+        
+        embeddings = None
+        if job_matcher is not None:
+            embeddings = job_matcher.encode_texts(texts, batch_size=batch_size)
+        
+        for row, (job, text) in enumerate(zip(jobs, texts)):
+            job['skills_mask'] = self.taxonomy.mask_from_text(text)
+            if job_matcher is not None:
+                job['keywords'] = job_matcher.extract_keywords(text)
+            if embeddings is not None:
+                job['embedding'] = embeddings[row]
+        
+        content_hashes = [job_content_hash(job) for job in jobs]
+        
+        renumbered = 0
+        for job, content_hash in zip(jobs, content_hashes):
+            feed_id = job.get('id')
+            if feed_id is None:
+                job['id'] = self._new_id()
+            elif feed_id in self._jobs_by_id:
+                job['id'] = self._new_id()
+                renumbered += 1
+                logging.debug(f"Job ID {feed_id} already exists; stored as {job['id']}")
+            elif feed_id.isdigit():
+                self._next_id = max(self._next_id, int(feed_id) + 1)
+            
+            self.jobs.append(job)
+            self._jobs_by_id[job['id']] = job
+            self._add_content_hash(content_hash)
+        
+        self._skill_matrix = None
+        return renumbered
+    
     def update_job(self, job_id, updated_data):
         """Update an existing job"""
-        for i, job in enumerate(self.jobs):
-            if job['id'] == job_id:
-                self.jobs[i].update(updated_data)
-                logging.info(f"Updated job: {job_id}")
-                return True
-        return False
+        job = self._jobs_by_id.get(job_id)
+        if job is None:
+            return False
+        
+        # Derive everything from the updated copy before touching stored state
+        updated_job = {**job, **updated_data}
+        old_hash = job_content_hash(job)
+        new_hash = job_content_hash(updated_job)
+        skills_mask = self.taxonomy.mask_from_text(f"{updated_job['description']} {updated_job['requirements']}")
+        
+        job.update(updated_data)
+        # Derived features are stale once the content changes
+        job.pop('keywords', None)
+        job.pop('embedding', None)
+        job['skills_mask'] = skills_mask
+        self._remove_content_hash(old_hash)
+        self._add_content_hash(new_hash)
+        self._skill_matrix = None
+        logging.info(f"Updated job: {job_id}")
+        return True
     
     def delete_job(self, job_id):
         """Delete a job from the database"""
         for i, job in enumerate(self.jobs):
             if job['id'] == job_id:
                 deleted_job = self.jobs.pop(i)
+                del self._jobs_by_id[job_id]
+                self._remove_content_hash(job_content_hash(deleted_job))
+                self._skill_matrix = None
                 logging.info(f"Deleted job: {deleted_job['title']}")
                 return True
         return False
@@ -1,21 +1,58 @@
 import logging
+import os
 import re
+import zlib
 try:
     from sentence_transformers import SentenceTransformer
-    from sklearn.metrics.pairwise import cosine_similarity
     SENTENCE_TRANSFORMERS_AVAILABLE = True
 except ImportError:
     SENTENCE_TRANSFORMERS_AVAILABLE = False
     logging.warning("sentence-transformers not available. Using keyword-based matching only.")
+from sklearn.metrics.pairwise import cosine_similarity
 import numpy as np
+from models import SkillTaxonomy, JobSkillMatrix
+from resume_analyzer import ResumeAnalyzer
+
+# Set to "stub" to use the offline StubEncoder instead of downloading a model
+ENCODER_ENV_VAR = 'JOB_MATCHER_ENCODER'
+
+class StubEncoder:
+    """Offline stand-in for SentenceTransformer using hashed bag-of-words vectors"""
+    
+    def __init__(self, dimensions=384):
+        """Initialize the encoder with the embedding size of all-MiniLM-L6-v2"""
+        self.dimensions = dimensions
+    
+    def encode(self, sentences, batch_size=32, **kwargs):
+        """Encode text(s) into deterministic unit-length vectors"""
+        single = isinstance(sentences, str)
+        if single:
+            sentences = [sentences]
+        
+        embeddings = np.zeros((len(sentences), self.dimensions), dtype=np.float32)
+        for row, sentence in enumerate(sentences):
+            for token in sentence.split():
+                embeddings[row, zlib.crc32(token.encode('utf-8')) % self.dimensions] += 1.0
+        
+        norms = np.linalg.norm(embeddings, axis=1, keepdims=True)
+        embeddings /= np.where(norms == 0, 1.0, norms)
+        return embeddings[0] if single else embeddings
 
 class JobMatcher:
     """Class for matching resumes with job descriptions"""
     
-    def __init__(self):
+    def __init__(self, encoder=None, taxonomy=None):
         """Initialize the job matcher with sentence transformer model"""
-        self.model = None
-        if SENTENCE_TRANSFORMERS_AVAILABLE:
+        if taxonomy is None:
+            taxonomy = SkillTaxonomy(ResumeAnalyzer.load_skills_keywords())
+        self.taxonomy = taxonomy
+        self.model = encoder
+        if self.model is not None:
+            logging.info(f"Using provided encoder: {type(self.model).__name__}")
+        elif os.environ.get(ENCODER_ENV_VAR) == 'stub':
+            self.model = StubEncoder()
+            logging.info("Using stub encoder for semantic matching")
+        elif SENTENCE_TRANSFORMERS_AVAILABLE:
             try:
                 # Use a lightweight sentence transformer model
                 self.model = SentenceTransformer('all-MiniLM-L6-v2')
@@ -78,7 +115,22 @@ class JobMatcher:
         
         return len(intersection) / len(union)
     
-    def calculate_semantic_similarity(self, resume_text, job_text):
+    def get_job_keywords(self, job_data):
+        """Get precomputed job keywords, extracting them from the job text if missing"""
+        keywords = job_data.get('keywords')
+        if keywords is None:
+            keywords = self.extract_keywords(f"{job_data['description']} {job_data['requirements']}")
+        return keywords
+    
+    def encode_texts(self, texts, batch_size=256):
+        """Encode many texts in encoder batches, returning None without a model"""
+        if not self.model or not texts:
+            return None
+        
+        cleaned = [self.preprocess_text(text) for text in texts]
+        return np.asarray(self.model.encode(cleaned, batch_size=batch_size), dtype=np.float32)
+    
+    def calculate_semantic_similarity(self, resume_text, job_text, job_embedding=None, resume_embedding=None):
         """Calculate semantic similarity using sentence transformers"""
         if not self.model:
             logging.warning("Sentence transformer model not available, using keyword matching only")
@@ -92,8 +144,15 @@ class JobMatcher:
             if not resume_clean or not job_clean:
                 return 0.0
             
-            # Generate embeddings
-            embeddings = self.model.encode([resume_clean, job_clean])
+            # Generate embeddings, reusing precomputed ones where available
+            if job_embedding is None and resume_embedding is None:
+                embeddings = self.model.encode([resume_clean, job_clean])
+            else:
+                if resume_embedding is None:
+                    resume_embedding = self.model.encode([resume_clean])[0]
+                if job_embedding is None:
+                    job_embedding = self.model.encode([job_clean])[0]
+                embeddings = [resume_embedding, job_embedding]
             
             # Calculate cosine similarity
             similarity = cosine_similarity([embeddings[0]], [embeddings[1]])[0][0]
@@ -104,13 +163,30 @@ class JobMatcher:
             logging.error(f"Error calculating semantic similarity: {str(e)}")
             return 0.0
     
-    def generate_feedback(self, resume_data, job_data, similarity_score):
+    def get_skills_mask(self, data, text):
+        """Get a precomputed skill bitmask, deriving it from text if missing"""
+        skills_mask = data.get('skills_mask')
+        if skills_mask is None:
+            skills_mask = self.taxonomy.mask_from_text(text)
+        return skills_mask
+    
+    def compare_skills(self, resume_data, jobs, skill_matrix=None):
+        """Get skill overlap and missing skills for each job from one bitmask query"""
+        if skill_matrix is None:
+            skill_matrix = JobSkillMatrix(
+                self.taxonomy,
+                [job['id'] for job in jobs],
+                [self.get_skills_mask(job, f"{job['description']} {job['requirements']}") for job in jobs]
+            )
+        resume_mask = self.get_skills_mask(resume_data, resume_data.get('raw_text', ''))
+        return skill_matrix.compare(resume_mask, [job['id'] for job in jobs])
+    
+    def generate_feedback(self, resume_data, job_data, similarity_score, missing_skills=None):
         """Generate improvement feedback for the resume"""
         feedback = []
         
         # Get job requirements and skills
-        job_text = f"{job_data['description']} {job_data['requirements']}"
-        job_keywords = self.extract_keywords(job_text)
+        job_keywords = self.get_job_keywords(job_data)
         
         # Get resume skills and keywords
         resume_text = resume_data.get('raw_text', '')
@@ -133,9 +209,14 @@ class JobMatcher:
         else:
             feedback.append("Excellent match! Your resume aligns well with the job requirements.")
         
-        # Suggest missing skills
-        if missing_keywords:
-            top_missing = missing_keywords[:5]  # Top 5 missing keywords
+        # Suggest missing skills first, then other missing keywords
+        suggestions = list(missing_skills or [])
+        for keyword in missing_keywords:
+            keyword = keyword.strip('.,;:!?()')
+            if keyword and keyword not in suggestions:
+                suggestions.append(keyword)
+        if suggestions:
+            top_missing = suggestions[:5]  # Top 5 missing skills/keywords
             feedback.append(f"Consider highlighting these relevant skills/keywords: {', '.join(top_missing)}")
         
         # Check for contact information
@@ -154,7 +235,25 @@ class JobMatcher:
         
         return feedback
     
-    def match_resume_to_job(self, resume_data, job_data):
+    def match_resume_to_jobs(self, resume_data, jobs, skill_matrix=None):
+        """Match a resume to several jobs, comparing skills for all of them at once"""
+        skill_matches = self.compare_skills(resume_data, jobs, skill_matrix)
+        
+        # Encode the resume once rather than once per job
+        resume_embedding = None
+        try:
+            embeddings = self.encode_texts([resume_data.get('raw_text', '')])
+            if embeddings is not None:
+                resume_embedding = embeddings[0]
+        except Exception as e:
+            logging.error(f"Error encoding resume: {str(e)}")
+        
+        return [
+            self.match_resume_to_job(resume_data, job, skill_match, resume_embedding)
+            for job, skill_match in zip(jobs, skill_matches)
+        ]
+    
+    def match_resume_to_job(self, resume_data, job_data, skill_match=None, resume_embedding=None):
         """Match a resume to a job and return detailed results"""
         try:
             # Prepare texts for comparison
@@ -162,18 +261,24 @@ class JobMatcher:
             job_text = f"{job_data['description']} {job_data['requirements']}"
             
             # Calculate different similarity metrics
-            semantic_similarity = self.calculate_semantic_similarity(resume_text, job_text)
+            semantic_similarity = self.calculate_semantic_similarity(
+                resume_text, job_text, job_data.get('embedding'), resume_embedding
+            )
             
             # Calculate keyword overlap
             resume_keywords = self.extract_keywords(resume_text)
-            job_keywords = self.extract_keywords(job_text)
+            job_keywords = self.get_job_keywords(job_data)
             keyword_overlap = self.calculate_keyword_overlap(resume_keywords, job_keywords)
             
             # Calculate overall similarity score (weighted average)
             overall_similarity = (semantic_similarity * 0.7) + (keyword_overlap * 0.3)
             
             # Generate feedback
-            feedback = self.generate_feedback(resume_data, job_data, overall_similarity)
+            if skill_match is None:
+                skill_match = self.compare_skills(resume_data, [job_data])[0]
+            feedback = self.generate_feedback(
+                resume_data, job_data, overall_similarity, skill_match['missing_skills']
+            )
             
             # Create match result
             match_result = {
@@ -187,6 +292,8 @@ class JobMatcher:
                 'keyword_overlap': round(keyword_overlap * 100, 1),
                 'feedback': feedback,
                 'matched_skills': list(set(resume_keywords).intersection(set(job_keywords)))[:10],  # Top 10 matched skills
+                'skill_overlap': skill_match['skill_overlap'],
+                'missing_skills': skill_match['missing_skills'],
                 'match_level': self.get_match_level(overall_similarity)
             }
             
@@ -0,0 +1,387 @@
+"""End-to-end load test for the /analyze -> /results flow.
+
+Replays a synthetic corpus of TXT/PDF resumes with varying job selections
+against the app and reports throughput, latency percentiles and the peak RSS
+of the largest process. Results are written as sorted JSON so runs can be
+diffed between commits.
+
+Examples:
+    python load_test.py --requests 200 --concurrency 8 --stub-encoder
+    python load_test.py --mode gunicorn --workers 4 --stub-encoder --output before.json
+"""
+import argparse
+import http.cookiejar
+import io
+import json
+import logging
+import os
+import random
+import resource
+import socket
+import subprocess
+import sys
+import threading
+import time
+import urllib.error
+import urllib.request
+import uuid
+from concurrent.futures import ThreadPoolExecutor
+
+from job_data import JobDatabase
+from job_matcher import ENCODER_ENV_VAR
+
+FIRST_NAMES = ['Alex', 'Jordan', 'Taylor', 'Morgan', 'Casey', 'Riley', 'Jamie', 'Avery']
+LAST_NAMES = ['Smith', 'Garcia', 'Chen', 'Patel', 'Okafor', 'Novak', 'Silva', 'Kim']
+SKILLS = [
+    'Python', 'JavaScript', 'React', 'SQL', 'AWS', 'Docker', 'Kubernetes', 'Terraform',
+    'Django', 'Flask', 'PostgreSQL', 'MongoDB', 'Git', 'Jenkins', 'TypeScript', 'Vue',
+    'HTML', 'CSS', 'Figma', 'Azure', 'Linux', 'pandas', 'numpy', 'scikit-learn'
+]
+DEGREES = [
+    'Bachelor of Science in Computer Science',
+    'Master of Science in Data Science',
+    'Bachelor of Arts in Design',
+    'MBA',
+    'PhD in Statistics'
+]
+ROLES = ['Software Engineer', 'Data Analyst', 'DevOps Engineer', 'Frontend Developer', 'Product Manager']
+DUTIES = [
+    'Built and maintained web applications used by thousands of customers.',
+    'Designed data pipelines and reporting dashboards for business stakeholders.',
+    'Automated CI/CD pipelines and cloud infrastructure provisioning.',
+    'Led a cross-functional team through agile delivery of new product features.',
+    'Improved application performance and reduced infrastructure costs.',
+    'Collaborated with designers to ship responsive user interfaces.'
+]
+
+
+def build_resume_text(rng):
+    """Build one synthetic resume as plain text"""
+    name = f"{rng.choice(FIRST_NAMES)} {rng.choice(LAST_NAMES)}"
+    lines = [
+        name,
+        f"{name.lower().replace(' ', '.')}@example.com",
+        f"({rng.randint(200, 999)}) {rng.randint(200, 999)}-{rng.randint(1000, 9999)}",
+        '',
+        'Summary',
+        f"{rng.choice(ROLES)} with {rng.randint(1, 15)}+ years of experience.",
+        '',
+        'Experience'
+    ]
+    for _ in range(rng.randint(2, 6)):
+        lines.append(f"{rng.choice(ROLES)}, {rng.choice(LAST_NAMES)} Corp")
+        lines.extend(rng.sample(DUTIES, 2))
+    lines.extend(['', 'Education', rng.choice(DEGREES), '', 'Skills'])
+    lines.append(', '.join(rng.sample(SKILLS, rng.randint(4, 12))))
+    return '\n'.join(lines) + '\n'
+
+
+def build_pdf(text):
+    """Build a minimal single-page PDF containing the given text"""
+    def escape(line):
+        return line.replace('\\', '\\\\').replace('(', '\\(').replace(')', '\\)')
+
+    stream_lines = ['BT', '/F1 10 Tf', '12 TL', '50 780 Td']
+    for line in text.splitlines():
+        stream_lines.append(f"({escape(line)}) Tj T*")
+    stream_lines.append('ET')
+    stream = '\n'.join(stream_lines).encode('latin-1', 'replace')
+
+    objects = [
+        b'<< /Type /Catalog /Pages 2 0 R >>',
+        b'<< /Type /Pages /Kids [3 0 R] /Count 1 >>',
+        b'<< /Type /Page /Parent 2 0 R /MediaBox [0 0 612 792] '
+        b'/Contents 4 0 R /Resources << /Font << /F1 5 0 R >> >> >>',
+        b'<< /Length ' + str(len(stream)).encode() + b' >>\nstream\n' + stream + b'\nendstream',
+        b'<< /Type /Font /Subtype /Type1 /BaseFont /Helvetica >>'
+    ]
+
+    out = io.BytesIO()
+    out.write(b'%PDF-1.4\n')
+    offsets = []
+    for number, body in enumerate(objects, start=1):
+        offsets.append(out.tell())
+        out.write(f"{number} 0 obj\n".encode() + body + b'\nendobj\n')
+    xref_offset = out.tell()
+    out.write(f"xref\n0 {len(objects) + 1}\n".encode())
+    out.write(b'0000000000 65535 f \n')
+    for offset in offsets:
+        out.write(f"{offset:010d} 00000 n \n".encode())
+    out.write(f"trailer\n<< /Size {len(objects) + 1} /Root 1 0 R >>\n".encode())
+    out.write(f"startxref\n{xref_offset}\n%%EOF\n".encode())
+    return out.getvalue()
+
+
+def build_corpus(size, job_ids, pdf_ratio=0.5, seed=0):
+    """Build a deterministic corpus of (extension, payload, selected job IDs) tuples"""
+    rng = random.Random(seed)
+    corpus = []
+    for _ in range(size):
+        text = build_resume_text(rng)
+        selected = rng.sample(job_ids, rng.randint(1, len(job_ids)))
+        if rng.random() < pdf_ratio:
+            corpus.append(('pdf', build_pdf(text), selected))
+        else:
+            corpus.append(('txt', text.encode('utf-8'), selected))
+    return corpus
+
+
+def percentile(sorted_values, pct):
+    """Nearest-rank percentile of an already sorted list"""
+    if not sorted_values:
+        return 0.0
+    rank = max(1, -(-len(sorted_values) * pct // 100))
+    return sorted_values[int(rank) - 1]
+
+
+def peak_process_rss_mb(who):
+    """Peak resident set size in MB of the largest process for RUSAGE_SELF or RUSAGE_CHILDREN"""
+    max_rss = resource.getrusage(who).ru_maxrss
+    # ru_maxrss is reported in bytes on macOS and in kilobytes elsewhere
+    divisor = 1024 * 1024 if sys.platform == 'darwin' else 1024
+    return max_rss / divisor
+
+
+class TestClientDriver:
+    """Drives the app in-process through per-thread Flask test clients"""
+
+    def __init__(self):
+        from app import app
+        self.app = app
+        self.local = threading.local()
+
+    def start(self):
+        pass
+
+    def stop(self):
+        pass
+
+    def peak_process_rss_mb(self):
+        return peak_process_rss_mb(resource.RUSAGE_SELF)
+
+    def run_flow(self, filename, payload, job_ids):
+        """Upload a resume and follow the redirect to /results"""
+        client = getattr(self.local, 'client', None)
+        if client is None:
+            client = self.local.client = self.app.test_client()
+
+        response = client.post(
+            '/analyze',
+            data={'resume': (io.BytesIO(payload), filename), 'jobs': job_ids},
+            content_type='multipart/form-data',
+            follow_redirects=True
+        )
+        return response.status_code == 200 and response.request.path == '/results'
+
+
+class GunicornDriver:
+    """Drives the app over HTTP in a gunicorn subprocess"""
+
+    def __init__(self, workers, threads, stub_encoder, startup_timeout=120):
+        self.workers = workers
+        self.threads = threads
+        self.stub_encoder = stub_encoder
+        self.startup_timeout = startup_timeout
+        self.process = None
+        self.port = None
+        self.base_url = None
+        self.local = threading.local()
+
+    def start(self):
+        """Start gunicorn on a free local port and wait until it serves requests"""
+        with socket.socket() as sock:
+            sock.bind(('127.0.0.1', 0))
+            port = sock.getsockname()[1]
+        self.port = port
+        self.base_url = f"http://127.0.0.1:{port}"
+
+        env = dict(os.environ)
+        if self.stub_encoder:
+            env[ENCODER_ENV_VAR] = 'stub'
+        command = [
+            sys.executable, '-m', 'gunicorn', '--preload', 'main:app',
+            '--bind', f"127.0.0.1:{port}",
+            '--workers', str(self.workers),
+            '--threads', str(self.threads),
+            '--log-level', 'warning'
+        ]
+        self.process = subprocess.Popen(command, env=env, cwd=os.path.dirname(os.path.abspath(__file__)))
+
+        deadline = time.monotonic() + self.startup_timeout
+        while time.monotonic() < deadline:
+            if self.process.poll() is not None:
+                raise RuntimeError(f"gunicorn exited with code {self.process.returncode}")
+            # With --preload the master binds only after the app (and any job feed) has
+            # loaded, so an accepted connection means it is ready; GET / would render
+            # every job and can be slow with a large feed
+            try:
+                socket.create_connection(('127.0.0.1', self.port), timeout=2).close()
+                return
+            except OSError:
+                time.sleep(0.5)
+        self.stop()
+        raise RuntimeError("gunicorn did not start in time")
+
+    def stop(self):
+        if self.process and self.process.poll() is None:
+            self.process.terminate()
+            self.process.wait(timeout=30)
+
+    def peak_process_rss_mb(self):
+        # Largest single reaped gunicorn process, not the total across workers
+        return peak_process_rss_mb(resource.RUSAGE_CHILDREN)
+
+    def run_flow(self, filename, payload, job_ids):
+        """Upload a resume and follow the redirect to /results"""
+        opener = getattr(self.local, 'opener', None)
+        if opener is None:
+            opener = self.local.opener = urllib.request.build_opener(
+                urllib.request.HTTPCookieProcessor(http.cookiejar.CookieJar())
+            )
+
+        boundary = uuid.uuid4().hex
+        parts = []
+        for job_id in job_ids:
+            parts.append(
+                f"--{boundary}\r\nContent-Disposition: form-data; name=\"jobs\"\r\n\r\n{job_id}\r\n".encode()
+            )
+        parts.append(
+            f"--{boundary}\r\nContent-Disposition: form-data; name=\"resume\"; filename=\"{filename}\"\r\n"
+            f"Content-Type: application/octet-stream\r\n\r\n".encode() + payload + b'\r\n'
+        )
+        parts.append(f"--{boundary}--\r\n".encode())
+
+        http_request = urllib.request.Request(
+            self.base_url + '/analyze',
+            data=b''.join(parts),
+            headers={'Content-Type': f"multipart/form-data; boundary={boundary}"}
+        )
+        try:
+            with opener.open(http_request, timeout=60) as response:
+                response.read()
+                return response.status == 200 and response.geturl().endswith('/results')
+        except (urllib.error.URLError, ConnectionError, socket.timeout):
+            return False
+
+
+def run_load_test(driver, corpus, total_requests, concurrency):
+    """Replay the corpus through the driver and collect per-request latencies"""
+    def task(index):
+        extension, payload, job_ids = corpus[index % len(corpus)]
+        # Unique filenames keep concurrent uploads from clobbering each other
+        filename = f"loadtest_{index:06d}.{extension}"
+        start = time.perf_counter()
+        try:
+            ok = driver.run_flow(filename, payload, job_ids)
+        except Exception as e:
+            logging.error(f"Request {index} failed: {str(e)}")
+            ok = False
+        return time.perf_counter() - start, ok
+
+    started = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=concurrency) as executor:
+        outcomes = list(executor.map(task, range(total_requests)))
+    elapsed = time.perf_counter() - started
+
+    latencies = sorted(latency * 1000 for latency, _ in outcomes)
+    errors = sum(1 for _, ok in outcomes if not ok)
+    # Only successful flows count, so fast error redirects cannot inflate throughput
+    successful = total_requests - errors
+    return {
+        'elapsed_s': round(elapsed, 3),
+        'errors': errors,
+        'throughput_rps': round(successful / elapsed, 2) if elapsed else 0.0,
+        'latency_ms': {
+            'mean': round(sum(latencies) / len(latencies), 2) if latencies else 0.0,
+            'p50': round(percentile(latencies, 50), 2),
+            'p95': round(percentile(latencies, 95), 2),
+            'p99': round(percentile(latencies, 99), 2),
+            'max': round(latencies[-1], 2) if latencies else 0.0
+        }
+    }
+
+
+def git_revision():
+    """Current git commit, if available, so reports can be matched to commits"""
+    try:
+        return subprocess.run(
+            ['git', 'rev-parse', '--short', 'HEAD'],
+            capture_output=True, text=True, check=True,
+            cwd=os.path.dirname(os.path.abspath(__file__))
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description="Load test the resume analysis flow")
+    parser.add_argument('--mode', choices=['client', 'gunicorn'], default='client',
+                        help="drive the Flask test client in threads or a gunicorn server over HTTP")
+    parser.add_argument('--requests', type=int, default=100, help="total number of /analyze requests")
+    parser.add_argument('--concurrency', type=int, default=4, help="number of concurrent clients")
+    parser.add_argument('--corpus-size', type=int, default=50, help="number of distinct synthetic resumes")
+    parser.add_argument('--pdf-ratio', type=float, default=0.5, help="fraction of resumes sent as PDF")
+    parser.add_argument('--seed', type=int, default=0, help="random seed for the corpus")
+    parser.add_argument('--workers', type=int, default=2, help="gunicorn worker processes")
+    parser.add_argument('--threads', type=int, default=4, help="gunicorn threads per worker")
+    parser.add_argument('--stub-encoder', action='store_true',
+                        help="use the offline stub encoder instead of sentence-transformers")
+    parser.add_argument('--warmup', type=int, default=5, help="untimed requests sent before measuring")
+    parser.add_argument('--output', help="write the JSON report to this file instead of stdout")
+    parser.add_argument('--log-level', default='WARNING', help="logging level while the test runs")
+    return parser.parse_args(argv)
+
+
+def main(argv=None):
+    args = parse_args(argv)
+
+    if args.stub_encoder:
+        # Must be set before the app (and its JobMatcher) is imported
+        os.environ[ENCODER_ENV_VAR] = 'stub'
+
+    if args.mode == 'gunicorn':
+        driver = GunicornDriver(args.workers, args.threads, args.stub_encoder)
+    else:
+        driver = TestClientDriver()
+    logging.getLogger().setLevel(args.log_level)
+
+    job_ids = [job['id'] for job in JobDatabase().get_all_jobs()]
+    corpus = build_corpus(args.corpus_size, job_ids, args.pdf_ratio, args.seed)
+
+    driver.start()
+    try:
+        if args.warmup:
+            run_load_test(driver, corpus, args.warmup, 1)
+        results = run_load_test(driver, corpus, args.requests, args.concurrency)
+    finally:
+        driver.stop()
+    results['peak_process_rss_mb'] = round(driver.peak_process_rss_mb(), 1)
+
+    report = {
+        'revision': git_revision(),
+        'config': {
+            'mode': args.mode,
+            'requests': args.requests,
+            'concurrency': args.concurrency,
+            'corpus_size': args.corpus_size,
+            'pdf_ratio': args.pdf_ratio,
+            'seed': args.seed,
+            'encoder': 'stub' if args.stub_encoder else 'sentence-transformers',
+            'workers': args.workers if args.mode == 'gunicorn' else None,
+            'threads': args.threads if args.mode == 'gunicorn' else None
+        },
+        'results': results
+    }
+
+    output = json.dumps(report, indent=2, sort_keys=True) + '\n'
+    if args.output:
+        with open(args.output, 'w') as f:
+            f.write(output)
+    else:
+        sys.stdout.write(output)
+
+    return 1 if results['errors'] else 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
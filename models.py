@@ -1,26 +1,197 @@
-# This file is kept for future database integration
-# Currently using in-memory storage for simplicity
+# Compact in-memory records for resumes and jobs
+# Skills are stored as integer bitsets over a SkillTaxonomy so that overlap
+# checks are AND/popcount operations instead of string-set operations
+import re
+import numpy as np
+
+WORD_BITS = 64
+WORD_MASK = (1 << WORD_BITS) - 1
+
+class SkillTaxonomy:
+    """Ordered skill vocabulary mapping each skill to a bit position"""
+    __slots__ = ('skills', 'index', 'n_words', 'pattern')
+
+    def __init__(self, skills_keywords):
+        """Build the taxonomy from a {category: [skills]} mapping"""
+        self.skills = []
+        self.index = {}
+        for category_skills in skills_keywords.values():
+            for skill in category_skills:
+                skill = skill.lower()
+                if skill not in self.index:
+                    self.index[skill] = len(self.skills)
+                    self.skills.append(skill)
+        self.n_words = max(1, -(-len(self.skills) // WORD_BITS))
+        # One alternation over whole skill tokens, longest first, so that e.g.
+        # "go" does not match inside "django" or "java" inside "javascript"
+        alternation = '|'.join(re.escape(skill) for skill in sorted(self.skills, key=len, reverse=True)) or '(?!)'
+        self.pattern = re.compile(rf'(?<![\w+#])(?:{alternation})(?![\w+#])')
+
+    def __len__(self):
+        return len(self.skills)
+
+    def mask_from_skills(self, skills):
+        """Encode a list of skill names as a bitmask, ignoring unknown skills"""
+        mask = 0
+        for skill in skills:
+            bit = self.index.get(skill.lower())
+            if bit is not None:
+                mask |= 1 << bit
+        return mask
+
+    def mask_from_text(self, text):
+        """Encode every taxonomy skill mentioned in the text as a bitmask"""
+        mask = 0
+        for match in self.pattern.finditer(text.lower()):
+            mask |= 1 << self.index[match.group(0)]
+        return mask
+
+    def skills_from_mask(self, mask):
+        """Decode a bitmask into skill names in taxonomy order"""
+        skills = []
+        while mask:
+            low_bit = mask & -mask
+            skills.append(self.skills[low_bit.bit_length() - 1])
+            mask ^= low_bit
+        return skills
+
+    def to_words(self, mask):
+        """Split a bitmask into 64-bit words, least significant first"""
+        return [(mask >> (WORD_BITS * i)) & WORD_MASK for i in range(self.n_words)]
+
+    def from_words(self, words):
+        """Join 64-bit words, least significant first, back into a bitmask"""
+        mask = 0
+        for i, word in enumerate(words):
+            mask |= int(word) << (WORD_BITS * i)
+        return mask
+
+    def masks_to_array(self, masks):
+        """Pack bitmasks into an (n, n_words) uint64 array"""
+        array = np.zeros((len(masks), self.n_words), dtype=np.uint64)
+        for row, mask in enumerate(masks):
+            array[row] = self.to_words(mask)
+        return array
+
+def popcount(array):
+    """Count set bits per row of a uint64 word array"""
+    if hasattr(np, 'bitwise_count'):
+        return np.bitwise_count(array).sum(axis=-1, dtype=np.int64)
+    # NumPy < 2.0 has no bitwise_count; unpack the bytes instead
+    bytes_view = np.ascontiguousarray(array).view(np.uint8)
+    return np.unpackbits(bytes_view, axis=-1).sum(axis=-1, dtype=np.int64)
+
+class JobSkillMatrix:
+    """NumPy array of job skill bitmasks for vectorised overlap queries"""
+    __slots__ = ('taxonomy', 'rows', 'masks', 'skill_counts')
+
+    def __init__(self, taxonomy, job_ids, masks):
+        """Build the matrix from parallel lists of job IDs and skill bitmasks"""
+        self.taxonomy = taxonomy
+        self.rows = {job_id: row for row, job_id in enumerate(job_ids)}
+        self.masks = taxonomy.masks_to_array(masks)
+        self.skill_counts = popcount(self.masks)
+
+    def __len__(self):
+        return len(self.rows)
+
+    def compare(self, resume_mask, job_ids):
+        """Compare a resume bitmask against the given jobs in one vectorised pass
+
+        Returns one dict per job ID, in order, with 'skill_overlap' (percentage of
+        the job's skills found in the resume) and 'missing_skills'.
+        """
+        rows = np.fromiter((self.rows[job_id] for job_id in job_ids), dtype=np.intp, count=len(job_ids))
+        job_masks = self.masks[rows]
+        resume_words = np.array(self.taxonomy.to_words(resume_mask), dtype=np.uint64)
+
+        overlap = popcount(job_masks & resume_words)
+        totals = self.skill_counts[rows]
+        ratios = np.divide(overlap, totals, out=np.zeros(len(rows)), where=totals > 0)
+        missing = job_masks & ~resume_words
+
+        return [
+            {
+                'skill_overlap': round(float(ratio) * 100, 1),
+                'missing_skills': self.taxonomy.skills_from_mask(self.taxonomy.from_words(words))
+            }
+            for ratio, words in zip(ratios, missing)
+        ]
 
 class ResumeModel:
     """Model for storing resume data"""
-    def __init__(self, name=None, email=None, phone=None, skills=None, 
-                 education=None, experience=None, raw_text=None):
+    __slots__ = ('name', 'email', 'phone', 'skills_mask', 'education', 'experience',
+                 'word_count', 'taxonomy')
+
+    def __init__(self, taxonomy, name=None, email=None, phone=None, skills_mask=0,
+                 education=None, experience=None, word_count=0):
+        self.taxonomy = taxonomy
         self.name = name
         self.email = email
         self.phone = phone
-        self.skills = skills or []
-        self.education = education or []
-        self.experience = experience or []
-        self.raw_text = raw_text
+        self.skills_mask = skills_mask
+        self.education = tuple(education or ())
+        self.experience = tuple(experience or ())
+        self.word_count = word_count
+
+    @classmethod
+    def from_resume_data(cls, resume_data, taxonomy):
+        """Build a record from ResumeAnalyzer.analyze_resume output, dropping the raw text"""
+        skills_mask = resume_data.get('skills_mask')
+        if skills_mask is None:
+            skills_mask = taxonomy.mask_from_skills(resume_data.get('skills', []))
+        return cls(
+            taxonomy,
+            name=resume_data.get('name'),
+            email=resume_data.get('email'),
+            phone=resume_data.get('phone'),
+            skills_mask=skills_mask,
+            education=resume_data.get('education'),
+            experience=resume_data.get('experience'),
+            word_count=resume_data.get('word_count', 0)
+        )
+
+    @property
+    def skills(self):
+        return self.taxonomy.skills_from_mask(self.skills_mask)
+
+    @property
+    def skill_count(self):
+        return self.skills_mask.bit_count()
+
+    def to_dict(self):
+        """Serializable form used for the session and templates"""
+        return {
+            'name': self.name,
+            'email': self.email,
+            'phone': self.phone,
+            'skills': self.skills,
+            'education': list(self.education),
+            'experience': list(self.experience),
+            'word_count': self.word_count,
+            'skill_count': self.skill_count
+        }
 
 class JobModel:
-    """Model for storing job data"""
-    def __init__(self, id, title, company, description, requirements, 
-                 location=None, salary=None):
-        self.id = id
-        self.title = title
-        self.company = company
-        self.description = description
-        self.requirements = requirements
-        self.location = location
-        self.salary = salary
+    """Field schema and validation for job data (JobDatabase stores jobs as dicts)"""
+    REQUIRED_FIELDS = ('title', 'company', 'description', 'requirements')
+    OPTIONAL_FIELDS = ('id', 'location', 'salary')
+
+    @classmethod
+    def validate(cls, job_data):
+        """Return a cleaned copy of a raw job dict, raising ValueError if it is invalid"""
+        if not isinstance(job_data, dict):
+            raise ValueError(f"Job must be an object, got {type(job_data).__name__}")
+
+        cleaned = {}
+        for field in cls.REQUIRED_FIELDS:
+            value = job_data.get(field)
+            if not isinstance(value, str) or not value.strip():
+                raise ValueError(f"Job is missing required field '{field}'")
+            cleaned[field] = value.strip()
+
+        for field in cls.OPTIONAL_FIELDS:
+            value = job_data.get(field)
+            if value is not None and str(value).strip():
+                cleaned[field] = str(value).strip()
+        return cleaned
@@ -7,6 +7,49 @@ from nltk.corpus import stopwords
 from nltk.tokenize import word_tokenize, sent_tokenize
 from collections import Counter
 import os
+from models import SkillTaxonomy
+
+# Precompiled extractors, applied once per relevant section
+EMAIL_PATTERN = re.compile(r'\b[A-Za-z0-9._%+-]+@[A-Za-z0-9.-]+\.[A-Z|a-z]{2,}\b')
+PHONE_PATTERN = re.compile(r'(\+?1?[-.\s]?)?\(?([0-9]{3})\)?[-.\s]?([0-9]{3})[-.\s]?([0-9]{4})')
+NAME_PATTERN = re.compile(r'[A-Za-z\s.]+')
+
+# Degree names in one alternation; abbreviations (including BSc/M.Sc. forms)
+# must stand alone so that e.g. "ma" inside "management" is not a degree
+DEGREE_PATTERN = re.compile(
+    r'\b(?:'
+    r'(?:bachelor|master)[\'s]?\s+(?:of\s+)?(?:science|arts|engineering|business)'
+    r'|phd|ph\.d|doctorate'
+    r'|associate[\'s]?\s+degree'
+    r'|m\.?b\.?a\.?|[bm]\.?(?:sc|[as])\.?'
+    r')(?![a-z])',
+    re.IGNORECASE
+)
+
+EXPERIENCE_PATTERN = re.compile(
+    r'(\d+)\s*\+?\s*(?:years?\s+(?:of\s+)?experience|yrs?\s+(?:of\s+)?(?:experience|exp))'
+    r'|experience[:\s]*(\d+)\s*\+?\s*years?',
+    re.IGNORECASE
+)
+
+# A section heading is a short line on its own, optionally followed by a colon
+SECTION_HEADING_PATTERN = re.compile(
+    r'^[ \t]*(?P<heading>'
+    r'(?:technical\s+|core\s+|key\s+)?skills(?:\s+summary)?|technologies|competencies'
+    r'|education(?:\s+and\s+training)?|academic\s+background|qualifications'
+    r'|(?:work\s+|professional\s+|employment\s+)?experience|employment(?:\s+history)?|work\s+history'
+    r'|(?:professional\s+)?summary|profile|objective'
+    r'|projects|certifications?|awards|publications|interests|references'
+    r')[ \t]*:?[ \t]*$',
+    re.IGNORECASE | re.MULTILINE
+)
+
+SECTION_KEYWORDS = [
+    ('skills', ('skill', 'technolog', 'competenc')),
+    ('education', ('educat', 'academic', 'qualification')),
+    ('experience', ('experience', 'employment', 'history')),
+    ('summary', ('summary', 'profile', 'objective'))
+]
 
 class ResumeAnalyzer:
     """Class for analyzing resumes and extracting key information"""
@@ -16,6 +59,7 @@ class ResumeAnalyzer:
         self.setup_nltk()
         self.setup_spacy()
         self.skills_keywords = self.load_skills_keywords()
+        self.skill_taxonomy = SkillTaxonomy(self.skills_keywords)
         
     def setup_nltk(self):
         """Download required NLTK data"""
@@ -39,7 +83,8 @@ class ResumeAnalyzer:
             logging.warning("spaCy model not found. Using basic NLP processing.")
             self.nlp = None
     
-    def load_skills_keywords(self):
+    @staticmethod
+    def load_skills_keywords():
         """Load common skills keywords for extraction"""
         return {
             'programming': [
@@ -93,21 +138,58 @@ class ResumeAnalyzer:
             logging.error(f"Error reading text file: {str(e)}")
             return None
     
+    def segment_sections(self, text):
+        """Split text into sections in one pass over the headings
+        
+        Returns a dict mapping section name ('contact', 'summary', 'education',
+        'experience', 'skills' or 'other') to a list of (start, end) character
+        offsets into text. Text before the first heading is the contact section.
+        """
+        sections = {}
+        name, start = 'contact', 0
+        
+        for match in SECTION_HEADING_PATTERN.finditer(text):
+            if match.start() > start:
+                sections.setdefault(name, []).append((start, match.start()))
+            name, start = self.get_section_name(match.group('heading')), match.end()
+        
+        if len(text) > start:
+            sections.setdefault(name, []).append((start, len(text)))
+        return sections
+    
+    def get_section_name(self, heading):
+        """Map a section heading to its canonical section name"""
+        heading = heading.lower()
+        for name, keywords in SECTION_KEYWORDS:
+            if any(keyword in heading for keyword in keywords):
+                return name
+        return 'other'
+    
+    def get_section_text(self, text, sections, *names):
+        """Get the text of the named sections, or the whole text if none were found"""
+        parts = [text[start:end] for name in names for start, end in sections.get(name, ())]
+        return '\n'.join(parts) if parts else text
+    
+    def extract_from_sections(self, extractor, text, sections, *names):
+        """Run an extractor on the named sections, falling back to the whole text if it finds nothing"""
+        section_text = self.get_section_text(text, sections, *names)
+        results = extractor(section_text)
+        if not results and section_text is not text:
+            results = extractor(text)
+        return results
+    
     def extract_contact_info(self, text):
         """Extract contact information from text"""
         contact_info = {}
         
         # Extract email
-        email_pattern = r'\b[A-Za-z0-9._%+-]+@[A-Za-z0-9.-]+\.[A-Z|a-z]{2,}\b'
-        emails = re.findall(email_pattern, text)
-        contact_info['email'] = emails[0] if emails else None
+        email = EMAIL_PATTERN.search(text)
+        contact_info['email'] = email.group(0) if email else None
         
         # Extract phone number
-        phone_pattern = r'(\+?1?[-.\s]?)?\(?([0-9]{3})\)?[-.\s]?([0-9]{3})[-.\s]?([0-9]{4})'
-        phones = re.findall(phone_pattern, text)
-        if phones:
-            phone = ''.join(phones[0])
-            contact_info['phone'] = phone
+        phone = PHONE_PATTERN.search(text)
+        if phone:
+            contact_info['phone'] = ''.join(group or '' for group in phone.groups())
         else:
             contact_info['phone'] = None
         
@@ -118,45 +200,24 @@ class ResumeAnalyzer:
             line = line.strip()
             if line and len(line.split()) <= 4 and len(line) > 2:
                 # Simple heuristic: if it's not too long and contains letters
-                if re.match(r'^[A-Za-z\s.]+$', line):
+                if NAME_PATTERN.fullmatch(line):
                     name = line
                     break
         
         contact_info['name'] = name
         return contact_info
     
+    def extract_skills_mask(self, text):
+        """Extract skills from text as a bitmask over the skill taxonomy"""
+        return self.skill_taxonomy.mask_from_text(text)
+    
     def extract_skills(self, text):
         """Extract skills from text"""
-        text_lower = text.lower()
-        found_skills = []
-        
-        # Check for each skill category
-        for category, skills in self.skills_keywords.items():
-            for skill in skills:
-                if skill.lower() in text_lower:
-                    found_skills.append(skill)
-        
-        # Remove duplicates and return
-        return list(set(found_skills))
+        return self.skill_taxonomy.skills_from_mask(self.extract_skills_mask(text))
     
     def extract_education(self, text):
         """Extract education information"""
-        education = []
-        
-        # Common degree patterns
-        degree_patterns = [
-            r'bachelor[\'s]?\s+(?:of\s+)?(?:science|arts|engineering|business)',
-            r'master[\'s]?\s+(?:of\s+)?(?:science|arts|engineering|business)',
-            r'phd|ph\.d|doctorate',
-            r'associate[\'s]?\s+degree',
-            r'b\.?s\.?|b\.?a\.?|m\.?s\.?|m\.?a\.?|m\.?b\.?a\.?'
-        ]
-        
-        for pattern in degree_patterns:
-            matches = re.findall(pattern, text, re.IGNORECASE)
-            for match in matches:
-                education.append(match.strip())
-        
+        education = [match.group(0).strip() for match in DEGREE_PATTERN.finditer(text)]
         return list(set(education))
     
     def extract_experience(self, text):
@@ -164,16 +225,9 @@ class ResumeAnalyzer:
         experience = []
         
         # Look for common experience indicators
-        experience_patterns = [
-            r'(\d+)\s*(?:\+)?\s*years?\s+(?:of\s+)?experience',
-            r'experience[:\s]*(\d+)\s*(?:\+)?\s*years?',
-            r'(\d+)\s*(?:\+)?\s*yrs?\s+(?:of\s+)?(?:experience|exp)'
-        ]
-        
-        for pattern in experience_patterns:
-            matches = re.findall(pattern, text, re.IGNORECASE)
-            for match in matches:
-                experience.append(f"{match} years of experience")
+        for match in EXPERIENCE_PATTERN.finditer(text):
+            years = match.group(1) or match.group(2)
+            experience.append(f"{years} years of experience")
         
         return experience
     
@@ -193,11 +247,23 @@ class ResumeAnalyzer:
                 logging.error("Failed to extract text from file")
                 return None
             
-            # Extract information
-            contact_info = self.extract_contact_info(text)
-            skills = self.extract_skills(text)
-            education = self.extract_education(text)
-            experience = self.extract_experience(text)
+            # Split into sections once, then run each extractor on its sections only
+            sections = self.segment_sections(text)
+            
+            contact_info = self.extract_contact_info(self.get_section_text(text, sections, 'contact'))
+            if 'contact' in sections and not (contact_info['email'] and contact_info['phone']):
+                # Contact details are sometimes placed in a footer
+                full_contact_info = self.extract_contact_info(text)
+                contact_info['email'] = contact_info['email'] or full_contact_info['email']
+                contact_info['phone'] = contact_info['phone'] or full_contact_info['phone']
+            
+            # Skills are matched across the whole text since jobs compare against all mentions
+            skills_mask = self.extract_skills_mask(text)
+            skills = self.skill_taxonomy.skills_from_mask(skills_mask)
+            education = self.extract_from_sections(self.extract_education, text, sections, 'education')
+            experience = self.extract_from_sections(
+                self.extract_experience, text, sections, 'summary', 'experience'
+            )
             
             # Create resume data structure
             resume_data = {
@@ -205,9 +271,11 @@ class ResumeAnalyzer:
                 'email': contact_info.get('email'),
                 'phone': contact_info.get('phone'),
                 'skills': skills,
+                'skills_mask': skills_mask,
                 'education': education,
                 'experience': experience,
                 'raw_text': text,
+                'sections': sections,
                 'word_count': len(text.split()),
                 'skill_count': len(skills)
             }
@@ -0,0 +1,44 @@
+import re
+
+import pytest
+
+from resume_analyzer import ResumeAnalyzer
+
+# The per-pattern degree extraction that DEGREE_PATTERN replaced
+BASELINE_DEGREE_PATTERNS = [
+    r'bachelor[\'s]?\s+(?:of\s+)?(?:science|arts|engineering|business)',
+    r'master[\'s]?\s+(?:of\s+)?(?:science|arts|engineering|business)',
+    r'phd|ph\.d|doctorate',
+    r'associate[\'s]?\s+degree',
+    r'b\.?s\.?|b\.?a\.?|m\.?s\.?|m\.?a\.?|m\.?b\.?a\.?'
+]
+
+
+def baseline_extract_education(text):
+    education = []
+    for pattern in BASELINE_DEGREE_PATTERNS:
+        education.extend(match.strip() for match in re.findall(pattern, text, re.IGNORECASE))
+    return set(education)
+
+
+# (text, baseline output, current output)
+DEGREE_CASES = [
+    ("BSc Computer Science", {'BS'}, {'BSc'}),
+    ("MSc in Data Science", {'MS'}, {'MSc'}),
+    ("M.Sc. Physics", {'M.S'}, {'M.Sc.'}),
+    ("B.S. in Mathematics", {'B.S.', 'Ma', 'ma'}, {'B.S.'}),
+    ("BA, History", {'BA'}, {'BA'}),
+    ("Master of Science in Statistics", {'Master of Science', 'Ma'}, {'Master of Science'}),
+    ("MBA, 2019", {'MBA'}, {'MBA'}),
+    ("PhD in Chemistry", {'PhD'}, {'PhD'}),
+    # The baseline reported "ma" from inside "management"
+    ("Project management lead", {'ma'}, set()),
+]
+
+
+@pytest.mark.parametrize("text,baseline,expected", DEGREE_CASES)
+def test_extract_education_against_baseline(text, baseline, expected):
+    # extract_education only uses the module-level pattern, so skip the NLP setup
+    analyzer = ResumeAnalyzer.__new__(ResumeAnalyzer)
+    assert baseline_extract_education(text) == baseline
+    assert set(analyzer.extract_education(text)) == expected